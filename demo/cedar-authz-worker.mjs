@@ -0,0 +1,81 @@
+#!/usr/bin/env node
+// Long-lived Cedar authorizer used by cedar-pdp-server.py when the cedarpy
+// bindings are not installed.
+//
+// Loads the schema, policies and entities once, then answers one JSON
+// authorization request per line on stdin with one JSON line on stdout.
+//
+// Usage: node demo/cedar-authz-worker.mjs <schema> <policies> <entities>
+// Requires: npm install --no-save @cedar-policy/cedar-wasm (run in demo/)
+import fs from "node:fs";
+import { createRequire } from "node:module";
+import readline from "node:readline";
+
+const require = createRequire(import.meta.url);
+
+const send = (message) => {
+  process.stdout.write(`${JSON.stringify(message)}\n`);
+};
+
+let cedar;
+try {
+  cedar = require("@cedar-policy/cedar-wasm/nodejs");
+} catch (err) {
+  send({ ready: false, error: `cannot load @cedar-policy/cedar-wasm: ${err.message}` });
+  process.exit(1);
+}
+
+const [schemaPath, policiesPath, entitiesPath] = process.argv.slice(2);
+const schema = fs.readFileSync(schemaPath, "utf8");
+const policies = { staticPolicies: fs.readFileSync(policiesPath, "utf8") };
+const entities = JSON.parse(fs.readFileSync(entitiesPath, "utf8"));
+
+// 'OpenClaw::Tool::"read"' -> { type: "OpenClaw::Tool", id: "read" }
+// (UIDs already in { type, id } form are passed through)
+const parseEntityUid = (uid) => {
+  if (typeof uid?.type === "string" && typeof uid?.id === "string") {
+    return { type: uid.type, id: uid.id };
+  }
+  const match = /^(.*)::"(.*)"$/s.exec(uid);
+  if (!match) {
+    throw new Error(`invalid entity uid: ${JSON.stringify(uid)}`);
+  }
+  return { type: match[1], id: match[2] };
+};
+
+const authorize = (request) => {
+  const answer = cedar.isAuthorized({
+    principal: parseEntityUid(request.principal),
+    action: parseEntityUid(request.action),
+    resource: parseEntityUid(request.resource),
+    context: request.context ?? {},
+    schema,
+    validateRequest: true,
+    policies,
+    entities,
+  });
+
+  // A request that fails validation is a Deny, as with cedarpy's NoDecision
+  if (answer.type !== "success") {
+    return { decision: "Deny", reason: [], errors: answer.errors.map((err) => err.message) };
+  }
+
+  const { decision, diagnostics } = answer.response;
+  return {
+    decision: decision === "allow" ? "Allow" : "Deny",
+    reason: diagnostics.reason,
+    errors: diagnostics.errors.map(
+      (err) => `error while evaluating policy \`${err.policyId}\`: ${err.error.message}`,
+    ),
+  };
+};
+
+send({ ready: true });
+
+readline.createInterface({ input: process.stdin }).on("line", (line) => {
+  try {
+    send(authorize(JSON.parse(line)));
+  } catch (err) {
+    send({ decision: "Deny", reason: [], errors: [String(err.message ?? err)] });
+  }
+});
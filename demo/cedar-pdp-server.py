@@ -2,15 +2,42 @@
 """
 Simple Cedar PDP HTTP server for OpenClaw authorization demo.
 
-This server wraps the Cedar CLI and provides an HTTP API for authorization requests.
+This server evaluates authorization requests in-process with the cedarpy
+bindings (falling back to the Cedar CLI when they are not installed) and
+provides an HTTP API for authorization requests.
 """
+import atexit
+import functools
+import hashlib
+import io
 import json
+import logging
+import os
+import re
 import subprocess
 import sys
 import tempfile
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import threading
+import time
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from pathlib import Path
 
+# Optional: in-process Cedar bindings (pip install cedarpy)
+try:
+    import cedarpy
+except ImportError:
+    cedarpy = None
+
+# Optional: faster JSON serialization (pip install orjson)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Per-request Cedar diagnostics are logged at DEBUG (PDP_LOG=DEBUG)
+_LOG = logging.getLogger("cedar-pdp")
+
 # Paths
 REPO_ROOT = Path(__file__).parent.parent
 CEDAR_DIR = REPO_ROOT / "policies" / "cedar"
@@ -20,6 +47,16 @@ POLICIES_TPE = CEDAR_DIR / "policies-tpe.cedar"
 POLICIES_DELEGATION = CEDAR_DIR / "policies-delegation.cedar"
 ENTITIES = CEDAR_DIR / "entities.json"
 
+# Files polled for changes; any change reloads the policy store
+WATCHED_FILES = [SCHEMA, POLICIES, POLICIES_DELEGATION, ENTITIES]
+WATCH_INTERVAL = 2.0
+
+DECISION_CACHE_SIZE = 4096
+DECISION_CACHE_SHARDS = 16  # power of two; indexed by the low bits of the key digest
+
+# Residual policy sets compiled from /query-constraints triples
+RESIDUAL_CACHE_SIZE = 256
+
 def build_combined_policies():
     """Combine base policies with delegation policies (if present) into a temp file."""
     content = POLICIES.read_text()
@@ -27,34 +64,775 @@ def build_combined_policies():
         content += "\n\n" + POLICIES_DELEGATION.read_text()
     return content
 
-# Build combined policies once at startup
-_combined_policies_content = build_combined_policies()
+# Combined policies file read by the CLI fallback (rewritten by PolicyStore.reload)
+COMBINED_POLICIES_FILE = Path(tempfile.gettempdir()) / "cedar-pdp-{}-policies.cedar".format(os.getpid())
+atexit.register(COMBINED_POLICIES_FILE.unlink, missing_ok=True)
+
+# Fixed cedar CLI arguments, built once; per-request arguments are appended
+_CEDAR_AUTHORIZE_CMD = [
+    'cedar', 'authorize',
+    '--verbose',
+    '--schema', str(SCHEMA),
+    '--policies', str(COMBINED_POLICIES_FILE),
+    '--entities', str(ENTITIES),
+    '--request-json', '/dev/stdin'
+]
+_CEDAR_TPE_CMD_PREFIX = [
+    'cedar', 'tpe',
+    '--schema', str(SCHEMA),
+    '--policies', str(POLICIES_TPE),
+    '--entities', str(ENTITIES)
+]
+_CEDAR_CWD = str(CEDAR_DIR)
+
+def stage_combined_policies_file(content):
+    """Write content to a temp file beside the combined policies file and return its path.
+
+    os.replace() the staged file over COMBINED_POLICIES_FILE to publish it
+    atomically, so concurrent CLI calls never see a partial write.
+    """
+    fd, tmp_path = tempfile.mkstemp(suffix='.cedar', dir=str(COMBINED_POLICIES_FILE.parent))
+    with os.fdopen(fd, 'w') as f:
+        f.write(content)
+    return tmp_path
+
+# Policy IDs (e.g. "policy-3-deny-system-writes") in verbose cedar CLI output
+_POLICY_ID_RE = re.compile(r'(?:policy|delegation)-[\w-]+', re.IGNORECASE)
+
+# Residual policies in `cedar tpe` output, from @id(...) through the closing ';'
+_RESIDUAL_RE = re.compile(r'^[ \t]*@id\([^)]*\)(?:"(?:[^"\\]|\\.)*"|[^";])*;', re.MULTILINE)
+
+def iter_residuals(tpe_output):
+    """Yield the residual policies in `cedar tpe` output, in order.
+
+    Each residual runs from its @id("...") annotation to the terminating
+    ';' (skipping over string literals, which may contain ';').
+    """
+    for match in _RESIDUAL_RE.finditer(tpe_output):
+        yield match.group(0)
+
+TPE_EXPLANATION = "These are the policy constraints that must be satisfied for authorization"
+
+# Action declarations (`action "ToolExec::Read" appliesTo ...`) and the
+# namespace in the Cedar schema, used to build warm-up requests
+_SCHEMA_NAMESPACE_RE = re.compile(r'^\s*namespace\s+([\w:]+)', re.MULTILINE)
+_SCHEMA_ACTION_RE = re.compile(r'^\s*action\s+"((?:[^"\\]|\\.)*)"', re.MULTILINE)
+
+# An action declared as a member of a group (`action "X" in [...]`)
+_SCHEMA_ACTION_GROUP_RE = re.compile(r'^\s*action\s+[^;{]*?\bin\b', re.MULTILINE)
+
+# The request shapes the deny prefilter checks: `action "X" appliesTo { ... }`
+# blocks and flat record types with comments stripped
+_SCHEMA_COMMENT_RE = re.compile(r'//[^\n]*')
+_SCHEMA_APPLIES_TO_RE = re.compile(r'\baction\s+"((?:[^"\\]|\\.)*)"\s+appliesTo\s*\{([^{}]*)\}')
+_SCHEMA_APPLIES_TO_FIELD_RE = re.compile(r'\b(principal|resource|context)\s*:\s*(\[[^\]]*\]|[\w:]+)')
+_SCHEMA_RECORD_TYPE_RE = re.compile(r'\btype\s+(\w+)\s*=\s*\{([^{}]*)\}')
+_SCHEMA_ATTR_RE = re.compile(r'"?(\w+)"?\s*(\??)\s*:\s*([\w:]+(?:<[\w:]+>)?)')
+
+# Checks for the context attribute types the deny prefilter understands
+_CONTEXT_TYPE_CHECKS = {
+    "String": lambda value: isinstance(value, str),
+    "Bool": lambda value: isinstance(value, bool),
+    "Set<String>": lambda value: isinstance(value, list) and all(isinstance(item, str) for item in value),
+}
+
+WARM_UP_ID = "pdp-warm-up"
+
+# Long-lived Node authorizer used when cedarpy is not installed
+WORKER_SCRIPT = Path(__file__).parent / "cedar-authz-worker.mjs"
+
+# Tokens that matter when numbering policies: strings and comments are
+# matched (and skipped) so a ';' or '@id(' inside them is not misread
+_POLICY_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|//[^\n]*|;|@id\(\s*"((?:[^"\\]|\\.)*)"\s*\)')
+
+def policy_id_annotations(policies_text):
+    """Map Cedar's positional policy ids ("policy0", ...) to their @id annotations."""
+    annotations = {}
+    index = 0
+    annotation = None
+    for match in _POLICY_TOKEN_RE.finditer(policies_text):
+        token = match.group(0)
+        if token.startswith('@id'):
+            annotation = match.group(1)
+        elif token == ';':
+            if annotation is not None:
+                annotations["policy{}".format(index)] = annotation
+            index += 1
+            annotation = None
+    return annotations
+
+# Cedar entity ID: "Namespace::Type::\"eid\""
+_EID_RE = re.compile(r'^(.*)::"([^"]*)"$')
+_EID_UNSAFE_RE = re.compile(r'[\\\x00-\x1f\x7f]')
+
+def parse_entity_id(full_id):
+    """Parse Cedar entity ID into type and eid."""
+    # Example: "OpenClaw::Agent::\"main\"" -> ("OpenClaw::Agent", "main")
+    match = _EID_RE.match(full_id)
+    if match:
+        return match.group(1), match.group(2)
+    return full_id, ""
+
+@functools.lru_cache(maxsize=1024)
+def short_name(full_id):
+    """Return the last segment of a Cedar entity ID, unquoted (for log lines)."""
+    # Example: "OpenClaw::Action::\"ToolExec::Read\"" -> "Read"
+    return full_id.rsplit("::", 1)[-1].strip('"')
+
+def json_dumps(payload, pretty=False, sort_keys=False):
+    """Serialize payload to UTF-8 JSON bytes, with orjson when available."""
+    if orjson is not None:
+        option = (orjson.OPT_INDENT_2 if pretty else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(payload, option=option)
+    separators = None if pretty else (',', ':')
+    return json.dumps(payload, indent=2 if pretty else None, sort_keys=sort_keys,
+                      separators=separators).encode('utf-8')
+
+def json_loads(data):
+    """Parse JSON from str or bytes, with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def bind_unknown_context(node):
+    """Replace unknown("context") in a residual policy (Cedar JSON) with the context variable."""
+    if isinstance(node, dict):
+        if "unknown" in node:
+            if node["unknown"] != [{"Value": "context"}]:
+                raise ValueError("residual depends on unknown {}".format(node["unknown"]))
+            return {"Var": "context"}
+        return {key: bind_unknown_context(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return [bind_unknown_context(item) for item in node]
+    return node
+
+def policies_to_est(policies_text):
+    """Convert Cedar policy text to its JSON form, or None if no converter is available."""
+    if cedarpy is not None:
+        return json_loads(cedarpy.policies_to_json_str(policies_text))
+    try:
+        result = subprocess.run(
+            ['cedar', 'translate-policy', '--direction', 'cedar-to-json'],
+            input=policies_text,
+            capture_output=True,
+            text=True,
+            cwd=_CEDAR_CWD
+        )
+    except FileNotFoundError:
+        return None
+    if result.returncode != 0:
+        return None
+    try:
+        return json_loads(result.stdout)
+    except ValueError:
+        return None
+
+def like_pattern_regex(pattern):
+    """Compile a Cedar `like` pattern (JSON form) to an equivalent regex."""
+    return re.compile(''.join('.*' if part == "Wildcard" else re.escape(part["Literal"])
+                              for part in pattern), re.DOTALL)
+
+def _or_operands(expr):
+    """Flatten a tree of `||` expressions into its operands, in evaluation order."""
+    if "||" in expr:
+        return _or_operands(expr["||"]["left"]) + _or_operands(expr["||"]["right"])
+    return [expr]
+
+def _context_clause(expr):
+    """Return (attr, match) for `context.attr like "..."` or `context.attr == "..."`, else None."""
+    for op in ("like", "=="):
+        if op not in expr:
+            continue
+        access = expr[op]["left"].get(".")
+        if access is None or access["left"] != {"Var": "context"}:
+            return None
+        if op == "like":
+            return access["attr"], like_pattern_regex(expr[op]["pattern"]).fullmatch
+        value = expr[op]["right"].get("Value")
+        if isinstance(value, str):
+            return access["attr"], lambda actual: actual == value
+    return None
+
+def _entity_type(uid):
+    """Return the entity type of a UID in string or {"type", "id"} form, or None.
+
+    None also for UIDs Cedar might reject or normalize (a non-string id, or
+    an eid with escapes or control characters), so Cedar decides those.
+    """
+    match = _EID_RE.match(entity_uid_key(uid) or "")
+    if match is None or _EID_UNSAFE_RE.search(match.group(2)):
+        return None
+    return match.group(1)
+
+def parse_request_schema(schema_text):
+    """Map each action uid in a Cedar schema to its (principal types, resource types, context attributes).
+
+    Context attributes map to (required, type). Only actions whose
+    appliesTo and context record use the simple forms in this demo's
+    schema are included; requests for other actions are left to Cedar.
+    """
+    text = _SCHEMA_COMMENT_RE.sub('', schema_text)
+    namespace = _SCHEMA_NAMESPACE_RE.search(text)
+    prefix = namespace.group(1) + "::" if namespace else ""
 
-def get_combined_policies_file():
-    """Write combined policies to a temp file and return the path."""
-    f = tempfile.NamedTemporaryFile(mode='w', suffix='.cedar', delete=False)
-    f.write(_combined_policies_content)
-    f.close()
-    return f.name
+    def qualify(name):
+        return name if "::" in name else prefix + name
+
+    records = {}
+    for name, body in _SCHEMA_RECORD_TYPE_RE.findall(text):
+        attrs = {attr: (not optional, attr_type) for attr, optional, attr_type in _SCHEMA_ATTR_RE.findall(body)}
+        if all(attr_type in _CONTEXT_TYPE_CHECKS for _, attr_type in attrs.values()):
+            records[name] = attrs
+
+    request_schema = {}
+    for action, body in _SCHEMA_APPLIES_TO_RE.findall(text):
+        fields = dict(_SCHEMA_APPLIES_TO_FIELD_RE.findall(body))
+        if set(fields) != {"principal", "resource", "context"} or fields["context"] not in records:
+            continue
+        principal_types = frozenset(qualify(t) for t in fields["principal"].strip("[]").replace(",", " ").split())
+        resource_types = frozenset(qualify(t) for t in fields["resource"].strip("[]").replace(",", " ").split())
+        request_schema['{}Action::"{}"'.format(prefix, action)] = (
+            principal_types, resource_types, records[fields["context"]])
+    return request_schema
+
+def _check_context(context, context_attrs):
+    """Return True if context has every required attribute, no others, and the declared types."""
+    if not isinstance(context, dict):
+        return False
+    for attr, (required, attr_type) in context_attrs.items():
+        if attr in context:
+            if not _CONTEXT_TYPE_CHECKS[attr_type](context[attr]):
+                return False
+        elif required:
+            return False
+    return all(attr in context_attrs for attr in context)
+
+def _error_free_type(expr, context_attrs, reads):
+    """Return the type of a policy expression (Cedar JSON) that cannot error at run time, or None.
+
+    Context attributes the expression reads are added to reads; it is only
+    error-free when all of them are present in the request context.
+    """
+    (op, arg), = expr.items()
+    if op == "Value":
+        if isinstance(arg, bool):
+            return "Bool"
+        if isinstance(arg, str):
+            return "String"
+        return "Entity" if isinstance(arg, dict) and "__entity" in arg else None
+    if op == "Var":
+        return "Entity" if arg in ("principal", "action", "resource") else None
+    if op == ".":
+        if arg["left"] != {"Var": "context"} or arg["attr"] not in context_attrs:
+            return None
+        reads.add(arg["attr"])
+        return context_attrs[arg["attr"]][1]
+    if op == "has":
+        return "Bool" if arg["left"] == {"Var": "context"} else None
+    if op == "like":
+        return "Bool" if _error_free_type(arg["left"], context_attrs, reads) == "String" else None
+    if op == "!":
+        return "Bool" if _error_free_type(arg["arg"], context_attrs, reads) == "Bool" else None
+    if op == "is":
+        return "Bool" if _error_free_type(arg["left"], context_attrs, reads) == "Entity" else None
+    if op in ("&&", "||", "==", "!=", "contains"):
+        left = _error_free_type(arg["left"], context_attrs, reads)
+        right = _error_free_type(arg["right"], context_attrs, reads)
+        if left is None or right is None:
+            return None
+        if op in ("&&", "||"):
+            return "Bool" if left == right == "Bool" else None
+        if op == "contains":
+            return "Bool" if left.startswith("Set<") else None
+        return "Bool"
+    return None
+
+def compile_deny_prefilter(policies_est, schema_text):
+    """Compile forbid policies (Cedar JSON, see policies_to_est) into a pure-Python deny check.
+
+    The returned function takes a Cedar request and returns the ids of the
+    forbid policies that deny it, exactly as Cedar would report them, or []
+    when Cedar has to decide. It only answers when, for the request's action
+    and principal type:
+
+    - the request passes the schema's principal, resource and context checks,
+    - every forbid policy in scope is compiled, i.e. its principal scope is
+      bare or `is T`, its resource scope is bare, and its `when` body is
+      `context.attr like/== "..."` clauses joined by `||`,
+    - no policy in scope can raise an evaluation error, so the diagnostics
+      have no errors, as in Cedar.
+
+    Returns None if nothing can be compiled.
+    """
+    if (policies_est is None or policies_est["templates"] or policies_est["templateLinks"]
+            or _SCHEMA_ACTION_GROUP_RE.search(schema_text)):
+        return None
+    request_schema = parse_request_schema(schema_text)
+
+    # action uid -> (principal types, resource types, context attributes, rules);
+    # each rule is (principal type or None for any, policy id, clauses, reads),
+    # with clauses None for a policy that blocks the prefilter for that principal
+    # type and [] for a permit that cannot error
+    rules_by_action = {}
+    for action_uid, (principal_types, resource_types, context_attrs) in request_schema.items():
+        rules = []
+        for policy_id, policy in policies_est["staticPolicies"].items():
+            action = policy["action"]
+            if action["op"] == "All":
+                in_scope = True
+            elif action["op"] not in ("==", "in"):
+                return None
+            else:
+                # `action == A`, `action in A` and `action in [A, ...]` (no action groups)
+                entities = action["entities"] if "entities" in action else [action["entity"]]
+                in_scope = any('{}::"{}"'.format(e["type"], e["id"]) == action_uid for e in entities)
+            if not in_scope:
+                continue
+
+            principal = policy["principal"]
+            principal_type = None
+            if principal["op"] == "is" and "in" not in principal:
+                principal_type = principal["entity_type"]
+                if principal_type not in principal_types:
+                    continue
+
+            reads = set()
+            error_free = all(_error_free_type(condition["body"], context_attrs, reads) == "Bool"
+                             for condition in policy["conditions"])
+            clauses = [] if error_free else None
+            if policy["effect"] == "forbid" and clauses is not None:
+                conditions = policy["conditions"]
+                if (principal["op"] not in ("All", "is") or "in" in principal
+                        or policy["resource"] != {"op": "All"}
+                        or len(conditions) != 1 or conditions[0]["kind"] != "when"):
+                    clauses = None
+                else:
+                    clauses = [_context_clause(operand) for operand in _or_operands(conditions[0]["body"])]
+                    if None in clauses:
+                        clauses = None
+            rules.append((principal_type, policy.get("annotations", {}).get("id", policy_id), clauses, reads))
+        rules_by_action[action_uid] = (principal_types, resource_types, context_attrs, rules)
+
+    if not rules_by_action:
+        return None
+
+    def deny_prefilter(cedar_request):
+        entry = rules_by_action.get(entity_uid_key(cedar_request.get("action")))
+        if entry is None:
+            return []
+        principal_types, resource_types, context_attrs, rules = entry
+        principal_type = _entity_type(cedar_request.get("principal"))
+        context = cedar_request.get("context")
+        if (principal_type not in principal_types
+                or _entity_type(cedar_request.get("resource")) not in resource_types
+                or not _check_context(context, context_attrs)):
+            return []
+
+        policy_ids = []
+        for rule_principal_type, policy_id, clauses, reads in rules:
+            if rule_principal_type is not None and rule_principal_type != principal_type:
+                continue
+            if clauses is None or not reads.issubset(context):
+                return []
+            if any(match(context[attr]) for attr, match in clauses):
+                policy_ids.append(policy_id)
+        return policy_ids
+
+    return deny_prefilter
+
+def slice_policies_by_action(policies_est, schema_text):
+    """Split policies (Cedar JSON) into a cedarpy PolicySet per action uid their scope names.
+
+    Policies whose scope applies to every action are in every slice. Policy
+    ids and annotations are kept, so diagnostics match the full set. Returns
+    {} (always use the full set) when the policies cannot be sliced safely,
+    e.g. when the schema declares action groups that `action in` would match.
+    """
+    if policies_est is None or policies_est["templates"] or _SCHEMA_ACTION_GROUP_RE.search(schema_text):
+        return {}
+
+    by_action = {}
+    any_action = {}
+    for policy_id, policy in policies_est["staticPolicies"].items():
+        action = policy["action"]
+        if action["op"] == "All":
+            any_action[policy_id] = policy
+            continue
+        if action["op"] not in ("==", "in"):
+            return {}
+        for entity in action["entities"] if "entities" in action else [action["entity"]]:
+            uid = '{}::"{}"'.format(entity["type"], entity["id"])
+            by_action.setdefault(uid, {})[policy_id] = policy
+
+    try:
+        return {
+            uid: cedarpy.PolicySet.from_json_str(json_dumps(
+                {"staticPolicies": dict(policies, **any_action), "templates": {}, "templateLinks": []}
+            ).decode('utf-8'))
+            for uid, policies in by_action.items()
+        }
+    except ValueError:
+        return {}
+
+def warm_up_requests(schema_text):
+    """Build one synthetic Agent/Tool request for each action declared in the schema."""
+    namespace = _SCHEMA_NAMESPACE_RE.search(schema_text)
+    prefix = namespace.group(1) + "::" if namespace else ""
+    return [{
+        "principal": '{}Agent::"{}"'.format(prefix, WARM_UP_ID),
+        "action": '{}Action::"{}"'.format(prefix, action),
+        "resource": '{}Tool::"{}"'.format(prefix, WARM_UP_ID),
+        # Empty strings rather than missing attributes, so policy conditions
+        # run to completion instead of stopping at the first error
+        "context": {"toolCallId": WARM_UP_ID, "filePath": "", "command": ""}
+    } for action in _SCHEMA_ACTION_RE.findall(schema_text)]
+
+def file_mtimes(paths):
+    """Return the modification time (ns) of each path, or None if it is missing."""
+    mtimes = []
+    for path in paths:
+        try:
+            mtimes.append(path.stat().st_mtime_ns)
+        except FileNotFoundError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+def build_cedar_request(authz_request):
+    """Build a Cedar request from an /authorize request body."""
+    return {
+        "principal": authz_request["principal"],
+        "action": authz_request["action"],
+        "resource": authz_request["resource"],
+        "context": authz_request.get("context", {})
+    }
+
+def build_response(decision, policy_ids, errors):
+    """Build an /authorize response body."""
+    return {
+        "decision": decision,
+        "diagnostics": {
+            "reason": policy_ids,
+            "errors": errors
+        }
+    }
+
+def entity_uid_key(uid):
+    """Return an entity UID, in string or {"type", "id"} form, as a string key (None for other forms)."""
+    if isinstance(uid, str):
+        return uid
+    if isinstance(uid, dict) and isinstance(uid.get("type"), str) and isinstance(uid.get("id"), str):
+        return '{}::"{}"'.format(uid["type"], uid["id"])
+    return None
+
+def decision_cache_key(cedar_request, generation):
+    """Key a Cedar request by a hash of its canonical JSON plus the policy store generation."""
+    canonical = json_dumps(cedar_request, sort_keys=True)
+    digest = hashlib.blake2b(canonical, digest_size=16).digest()
+    return (digest, generation)
+
+class StripedLRU:
+    """Thread-safe LRU cache split into independently locked shards.
+
+    Keys are decision_cache_key tuples; the low bits of the digest pick the
+    shard, so concurrent requests rarely wait on the same lock.
+    """
+
+    def __init__(self, maxsize=DECISION_CACHE_SIZE, shards=DECISION_CACHE_SHARDS):
+        self.shard_maxsize = max(1, maxsize // shards)
+        self._mask = shards - 1
+        # Each shard is (lock, entries, [hits, misses])
+        self._shards = [(threading.Lock(), OrderedDict(), [0, 0]) for _ in range(shards)]
+
+    def _shard(self, key):
+        return self._shards[key[0][0] & self._mask]
+
+    def get(self, key):
+        """Return the cached response for key, or None."""
+        lock, entries, counts = self._shard(key)
+        with lock:
+            response = entries.get(key)
+            if response is None:
+                counts[1] += 1
+                return None
+            entries.move_to_end(key)
+            counts[0] += 1
+            return response
+
+    def put(self, key, response):
+        """Cache a response, evicting the shard's least recently used entry when full."""
+        lock, entries, _ = self._shard(key)
+        with lock:
+            entries[key] = response
+            entries.move_to_end(key)
+            if len(entries) > self.shard_maxsize:
+                entries.popitem(last=False)
+
+    def stats(self):
+        """Return size and hit-rate counters summed over all shards."""
+        size = hits = misses = 0
+        for lock, entries, counts in self._shards:
+            with lock:
+                size += len(entries)
+                hits += counts[0]
+                misses += counts[1]
+        lookups = hits + misses
+        return {
+            "size": size,
+            "maxsize": self.shard_maxsize * len(self._shards),
+            "hits": hits,
+            "misses": misses,
+            "hitRate": hits / lookups if lookups else 0.0
+        }
+
+class CedarWorker:
+    """Long-lived cedar-authz-worker.mjs process answering requests over NDJSON pipes."""
+
+    def __init__(self):
+        self.process = None
+        self.lock = threading.Lock()
+
+    def _spawn(self, policies_path):
+        """Start a worker process on policies_path and wait until it is ready, or return None."""
+        try:
+            process = subprocess.Popen(
+                ['node', str(WORKER_SCRIPT), str(SCHEMA), str(policies_path), str(ENTITIES)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                bufsize=0,
+                cwd=str(CEDAR_DIR)
+            )
+        except FileNotFoundError:
+            return None
+
+        # Requests are written unbuffered, but responses are read through a
+        # buffer so readline() is not one read() syscall per byte
+        process.stdout = io.BufferedReader(process.stdout)
+
+        # The worker announces {"ready": true} once policies are loaded
+        try:
+            status = json_loads(process.stdout.readline())
+        except ValueError:
+            status = {}
+        if not status.get("ready"):
+            process.kill()
+            process.wait()
+            if status.get("error"):
+                sys.stderr.write("Cedar worker: {}\n".format(status["error"]))
+            return None
+        return process
+
+    def start(self, policies_path=COMBINED_POLICIES_FILE):
+        """(Re)start the worker on the given policies; return False if it cannot run."""
+        process = self._spawn(policies_path)
+        if process is None:
+            return False
+
+        with self.lock:
+            old_process, self.process = self.process, process
+        if old_process is not None:
+            old_process.stdin.close()
+            old_process.wait()
+        return True
+
+    def authorize(self, cedar_request):
+        """Send one request line and read back one response line.
+
+        A worker that has died is restarted once on the current combined
+        policies file. Returns None if it cannot be restarted (or was already
+        given up on), so the caller can fall back to the CLI.
+        """
+        line = json_dumps(cedar_request) + b"\n"
+        with self.lock:
+            for attempt in range(2):
+                if self.process is not None:
+                    try:
+                        self.process.stdin.write(line)
+                        response = self.process.stdout.readline()
+                    except OSError:
+                        response = b""
+                    if response:
+                        return json_loads(response)
+
+                    # The worker died; reap it and start a fresh one
+                    self.process.kill()
+                    self.process.wait()
+                    self.process = None
+                    if attempt == 0:
+                        sys.stderr.write("ERROR: Cedar worker exited unexpectedly, restarting\n")
+                        self.process = self._spawn(COMBINED_POLICIES_FILE)
+            return None
+
+class PolicyStore:
+    """Parsed Cedar schema, policies and entities, reloaded when their files change."""
+
+    def __init__(self):
+        self.policy_set = None
+        self.schema = None
+
+        # Subsets of policy_set keyed by action uid; see slice_policies_by_action
+        self.policy_slices = {}
+        self.entities = None
+        self.generation = 0
+        self.mtimes = None
+        self.lock = threading.Lock()
+
+        # Residual policy sets keyed by a hash of the (principal, action,
+        # resource) uid keys; see compile_residual
+        self.residuals = StripedLRU(RESIDUAL_CACHE_SIZE)
+
+        # Pure-Python check for requests that simple forbid policies deny; see compile_deny_prefilter
+        self.deny_prefilter = None
+
+        # Used when cedarpy is not installed (see main)
+        self.cedar_worker = None
+        self.policy_annotations = {}
+
+    def reload(self):
+        """Load schema, combined policies and entities and bump the generation."""
+        # Record mtimes before reading so a concurrent edit triggers another reload
+        mtimes = file_mtimes(WATCHED_FILES)
+
+        combined_policies = build_combined_policies()
+        schema_text = SCHEMA.read_text()
+        if cedarpy is not None:
+            schema = cedarpy.Schema.from_str(schema_text)
+            policy_set = cedarpy.PolicySet.from_str(combined_policies)
+            entities = cedarpy.Entities.from_json_str(ENTITIES.read_text(), schema)
+        policies_est = policies_to_est(combined_policies)
+        deny_prefilter = compile_deny_prefilter(policies_est, schema_text)
+        if cedarpy is not None:
+            policy_slices = slice_policies_by_action(policies_est, schema_text)
+
+        with self.lock:
+            if cedarpy is not None:
+                self.schema = schema
+                self.policy_set = policy_set
+                self.policy_slices = policy_slices
+                self.entities = entities
+            else:
+                # Start the worker on the new policies before publishing them, so
+                # a failed start leaves the file, annotations and running worker
+                # all on the previous policies
+                staged_path = stage_combined_policies_file(combined_policies)
+                if self.cedar_worker is not None and not self.cedar_worker.start(staged_path):
+                    os.unlink(staged_path)
+                    raise RuntimeError("failed to restart Cedar worker on the new policies")
+                os.replace(staged_path, str(COMBINED_POLICIES_FILE))
+                self.policy_annotations = policy_id_annotations(combined_policies)
+
+            self.mtimes = mtimes
+            self.generation += 1
+            self.residuals = StripedLRU(RESIDUAL_CACHE_SIZE)
+            self.deny_prefilter = deny_prefilter
+
+    def reload_if_changed(self):
+        """Reload if any schema, policy or entity file changed on disk."""
+        mtimes = file_mtimes(WATCHED_FILES)
+        if mtimes == self.mtimes:
+            return
+        try:
+            self.reload()
+            print("Reloaded Cedar policies and entities")
+        except (OSError, ValueError, RuntimeError) as e:
+            # Keep serving the last good state until the files change again
+            sys.stderr.write("ERROR: failed to reload Cedar policies: {}\n".format(e))
+            self.mtimes = mtimes
+
+    def snapshot(self):
+        """Return a consistent (generation, policy_set, policy_slices, schema, entities, residuals) view."""
+        with self.lock:
+            return (self.generation, self.policy_set, self.policy_slices, self.schema,
+                    self.entities, self.residuals)
+
+    def compile_residual(self, principal, action, resource):
+        """Cache the policies left after partially evaluating a triple with unknown context.
+
+        The residuals only depend on context, so /authorize can evaluate a
+        request for the same triple against this much smaller policy set.
+        Best effort: triples that cannot be compiled are left to the full set.
+        """
+        generation, policy_set, policy_slices, schema, entities, residuals = self.snapshot()
+        triple = (entity_uid_key(principal), entity_uid_key(action), entity_uid_key(resource))
+        if None in triple:
+            return
+        key = decision_cache_key(triple, generation)
+        if residuals.get(key) is not None:
+            return
+
+        partial_request = {"principal": principal, "action": action, "resource": resource, "context": None}
+        try:
+            result = cedarpy.is_authorized_partial(partial_request, policy_slices.get(triple[1], policy_set),
+                                                   entities, schema)
+            if result.diagnostics.errors:
+                return
+
+            # Drop policies that can no longer apply, and bind the rest to the
+            # real context so they can be evaluated as ordinary policies
+            static_policies = {}
+            for policy_id, policy in result.residuals.items():
+                if policy["conditions"] == [{"kind": "when", "body": {"Value": False}}]:
+                    continue
+                static_policies[policy_id] = bind_unknown_context(policy)
+            residual_set = cedarpy.PolicySet.from_json_str(json_dumps(
+                {"staticPolicies": static_policies, "templates": {}, "templateLinks": []}).decode('utf-8'))
+        except ValueError:
+            return
+
+        # A reload replaces the cache, so a residual compiled against older
+        # policies lands in the discarded one
+        residuals.put(key, residual_set)
+
+    def warm_up(self, cedar_requests):
+        """Evaluate requests once, discarding the results, so the engine is warm before serving."""
+        if cedarpy is not None:
+            # Warm each action's policy slice, the set its requests are evaluated against
+            _, policy_set, policy_slices, schema, entities, _ = self.snapshot()
+            by_action = {}
+            for cedar_request in cedar_requests:
+                by_action.setdefault(entity_uid_key(cedar_request["action"]), []).append(cedar_request)
+            for action, batch in by_action.items():
+                cedarpy.is_authorized_batch(batch, policy_slices.get(action, policy_set), entities, schema)
+        elif self.cedar_worker is not None:
+            for cedar_request in cedar_requests:
+                self.cedar_worker.authorize(cedar_request)
+
+    def watch(self, interval=WATCH_INTERVAL):
+        """Poll the files from a daemon thread so requests never stat them."""
+        def poll():
+            while True:
+                time.sleep(interval)
+                self.reload_if_changed()
+
+        threading.Thread(target=poll, name="policy-watcher", daemon=True).start()
+
+_policy_store = PolicyStore()
 
 class CedarPDPHandler(BaseHTTPRequestHandler):
     """HTTP handler for Cedar authorization requests."""
 
+    # Keep connections open between requests; responses carry a
+    # Content-Length, except /query-constraints, which is sent chunked
+    protocol_version = "HTTP/1.1"
+
+    decision_cache = StripedLRU()
+
     def do_POST(self):
-        """Handle POST requests to /authorize or /query-constraints."""
-        # Read request body
+        """Handle POST requests to /authorize, /authorize-batch or /query-constraints."""
+        # Read request body (the JSON parser takes bytes directly)
         content_length = int(self.headers.get('Content-Length', 0))
-        body = self.rfile.read(content_length).decode('utf-8')
+        body = self.rfile.read(content_length)
 
         try:
-            request_data = json.loads(body)
+            request_data = json_loads(body)
 
             if self.path == "/authorize":
                 self._handle_authorize(request_data)
+            elif self.path == "/authorize-batch":
+                self._handle_authorize_batch(request_data)
             elif self.path == "/query-constraints":
                 self._handle_query_constraints(request_data)
             else:
-                self.send_error(404, "Not Found - use POST /authorize or /query-constraints")
+                self.send_error(404, "Not Found - use POST /authorize, /authorize-batch or /query-constraints")
 
         except Exception as e:
             error_msg = str(e)
@@ -63,93 +841,168 @@ class CedarPDPHandler(BaseHTTPRequestHandler):
 
     def _handle_authorize(self, authz_request):
         """Handle authorization request."""
-        try:
+        cedar_request = build_cedar_request(authz_request)
+        response = self._authorize([cedar_request])[0]
 
-            # Build Cedar request
-            cedar_request = {
-                "principal": authz_request["principal"],
-                "action": authz_request["action"],
-                "resource": authz_request["resource"],
-                "context": authz_request.get("context", {})
-            }
-
-            # Write request to temp file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-                json.dump(cedar_request, f)
-                request_file = f.name
-
-            # Use combined policies (base + delegation) for authorization
-            combined_policies_file = get_combined_policies_file()
-            try:
-                # Call cedar CLI with --verbose to get policy IDs
-                result = subprocess.run(
-                    [
-                        'cedar', 'authorize',
-                        '--verbose',
-                        '--schema', str(SCHEMA),
-                        '--policies', combined_policies_file,
-                        '--entities', str(ENTITIES),
-                        '--request-json', request_file
-                    ],
-                    capture_output=True,
-                    text=True,
-                    cwd=str(CEDAR_DIR)
-                )
-
-                # Debug: Show Cedar CLI output
-                print("\n--- Cedar Request ---")
-                print(json.dumps(cedar_request, indent=2))
-                print("\n--- Cedar CLI Output ---")
-                print(result.stdout)
-                if result.stderr:
-                    print("--- Cedar CLI Errors ---")
-                    print(result.stderr)
-                print("--- End Cedar Output ---\n")
-
-                # Parse Cedar output
-                decision = "Allow" if "ALLOW" in result.stdout else "Deny"
-
-                # Extract policy IDs from verbose output
-                policy_ids = []
-                for line in result.stdout.split('\n'):
-                    if 'policy-' in line.lower() or 'delegation-' in line.lower():
-                        import re
-                        matches = re.findall(r'(?:policy|delegation)-[\w-]+', line, re.IGNORECASE)
-                        policy_ids.extend(matches)
-
-                # Remove duplicates while preserving order
-                policy_ids = list(dict.fromkeys(policy_ids))
-
-                # Build response
-                response = {
-                    "decision": decision,
-                    "diagnostics": {
-                        "reason": policy_ids,
-                        "errors": []
-                    }
-                }
-
-                # Send response
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps(response).encode('utf-8'))
-
-                # Log
-                tool = authz_request.get("resource", "").split("::")[- 1].strip('"')
-                action = authz_request.get("action", "").split("::")[- 1].strip('"')
-                principal = authz_request.get("principal", "")
-                is_subagent = "SubAgent" in principal
-                prefix = "[{}]{}".format(decision, " [SubAgent]" if is_subagent else "")
-                print("{} {} - {}".format(prefix, tool, action))
-
-            finally:
-                Path(request_file).unlink(missing_ok=True)
-                Path(combined_policies_file).unlink(missing_ok=True)
+        self._send_json(response)
+        self._log_decision(authz_request, response["decision"])
 
-        except Exception as e:
-            # Re-raise to be caught by outer handler
-            raise
+    def _handle_authorize_batch(self, batch_request):
+        """Handle a batch of authorization requests, answered in input order."""
+        authz_requests = batch_request["requests"]
+        cedar_requests = [build_cedar_request(r) for r in authz_requests]
+        responses = self._authorize(cedar_requests)
+
+        self._send_json(responses)
+        for authz_request, response in zip(authz_requests, responses):
+            self._log_decision(authz_request, response["decision"])
+
+    def _authorize(self, cedar_requests):
+        """Evaluate Cedar requests and return one response per request, using cached decisions."""
+        # Bind hot lookups to locals once rather than per request in the batch
+        generation = _policy_store.generation
+        deny_prefilter = _policy_store.deny_prefilter
+        cache_key = decision_cache_key
+        cache_get = self.decision_cache.get
+
+        # Requests a forbid policy provably denies skip the cache and Cedar
+        keys = [None] * len(cedar_requests)
+        responses = [None] * len(cedar_requests)
+        for i, cedar_request in enumerate(cedar_requests):
+            policy_ids = deny_prefilter(cedar_request) if deny_prefilter is not None else None
+            if policy_ids:
+                responses[i] = build_response("Deny", policy_ids, [])
+            else:
+                keys[i] = cache_key(cedar_request, generation)
+                responses[i] = cache_get(keys[i])
+
+        # Evaluate only the cache misses
+        misses = [i for i, response in enumerate(responses) if response is None]
+        if misses:
+            cache_put = self.decision_cache.put
+            evaluated = self._evaluate([cedar_requests[i] for i in misses])
+            for i, response in zip(misses, evaluated):
+                cache_put(keys[i], response)
+                responses[i] = response
+
+        return responses
+
+    def _evaluate(self, cedar_requests):
+        """Evaluate Cedar requests with the bindings or the CLI."""
+        if cedarpy is not None:
+            return self._authorize_in_process(cedar_requests)
+        if _policy_store.cedar_worker is not None:
+            return [self._authorize_worker(cedar_request) for cedar_request in cedar_requests]
+        return [self._authorize_cli(cedar_request) for cedar_request in cedar_requests]
+
+    def _send_json(self, payload):
+        """Send a 200 response with a JSON body."""
+        body = json_dumps(payload)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _log_decision(self, authz_request, decision):
+        """Print a one-line summary of an authorization decision."""
+        # Entity UIDs may also arrive in {"type", "id"} form
+        tool = short_name(entity_uid_key(authz_request.get("resource")) or "")
+        action = short_name(entity_uid_key(authz_request.get("action")) or "")
+        principal = entity_uid_key(authz_request.get("principal")) or ""
+        is_subagent = "SubAgent" in principal
+        prefix = "[{}]{}".format(decision, " [SubAgent]" if is_subagent else "")
+        print("{} {} - {}".format(prefix, tool, action))
+
+    def _authorize_in_process(self, cedar_requests):
+        """Evaluate Cedar requests in one batch with the preloaded cedarpy policy set."""
+        generation, policy_set, policy_slices, schema, entities, residuals = _policy_store.snapshot()
+
+        # Requests whose triple has a cached residual are evaluated against it;
+        # the rest are batched by action and evaluated against that action's
+        # slice of the policies (or the full set for actions without one)
+        results = [None] * len(cedar_requests)
+        pending_by_action = {}
+        for i, cedar_request in enumerate(cedar_requests):
+            action = entity_uid_key(cedar_request["action"])
+            triple = (entity_uid_key(cedar_request["principal"]), action,
+                      entity_uid_key(cedar_request["resource"]))
+            residual_set = None
+            if None not in triple:
+                residual_set = residuals.get(decision_cache_key(triple, generation))
+            if residual_set is not None:
+                results[i] = cedarpy.is_authorized(cedar_request, residual_set, entities, schema)
+            else:
+                pending_by_action.setdefault(action, []).append(i)
+
+        for action, pending in pending_by_action.items():
+            batch = [cedar_requests[i] for i in pending]
+            batch_set = policy_slices.get(action, policy_set)
+            for i, result in zip(pending, cedarpy.is_authorized_batch(batch, batch_set, entities, schema)):
+                results[i] = result
+
+        debug = _LOG.isEnabledFor(logging.DEBUG)
+        responses = []
+        for cedar_request, result in zip(cedar_requests, results):
+            if debug:
+                _LOG.debug("Cedar request: %s", json_dumps(cedar_request).decode('utf-8'))
+                _LOG.debug("Cedar result: %s %s errors=%s", result.decision.name,
+                           list(result.diagnostics.reasons), list(result.diagnostics.errors))
+
+            # Report @id annotations (e.g. "policy-3-deny-system-writes") rather
+            # than the positional ids ("policy2"), matching the CLI output
+            annotations = result.diagnostics.id_annotations_by_reason
+            policy_ids = [annotations.get(reason, reason) for reason in result.diagnostics.reasons]
+
+            # NoDecision (e.g. a request that fails schema validation) is a Deny
+            decision = "Allow" if result.allowed else "Deny"
+            responses.append(build_response(decision, policy_ids, list(result.diagnostics.errors)))
+
+        return responses
+
+    def _authorize_worker(self, cedar_request):
+        """Evaluate a Cedar request with the long-lived Node worker."""
+        result = _policy_store.cedar_worker.authorize(cedar_request)
+        if result is None:
+            # The worker died and could not be restarted
+            return self._authorize_cli(cedar_request)
+
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("Cedar request: %s", json_dumps(cedar_request).decode('utf-8'))
+            _LOG.debug("Cedar worker result: %s", json_dumps(result).decode('utf-8'))
+
+        # The worker reports positional ids; map them to @id annotations
+        annotations = _policy_store.policy_annotations
+        policy_ids = [annotations.get(reason, reason) for reason in result["reason"]]
+        return build_response(result["decision"], policy_ids, result["errors"])
+
+    def _authorize_cli(self, cedar_request):
+        """Evaluate a Cedar request by invoking the cedar CLI."""
+        # Call cedar CLI with --verbose to get policy IDs; the request is
+        # passed on stdin and the combined policies file is written at load time
+        request_json = json_dumps(cedar_request)
+        result = subprocess.run(
+            _CEDAR_AUTHORIZE_CMD,
+            input=request_json,
+            capture_output=True,
+            cwd=_CEDAR_CWD
+        )
+        stdout = result.stdout.decode('utf-8', errors='replace')
+
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("Cedar request: %s", request_json.decode('utf-8'))
+            _LOG.debug("Cedar CLI output:\n%s", stdout)
+            if result.stderr:
+                _LOG.debug("Cedar CLI errors:\n%s", result.stderr.decode('utf-8', errors='replace'))
+
+        # Parse Cedar output
+        decision = "Allow" if "ALLOW" in stdout else "Deny"
+
+        # Extract policy IDs from verbose output in one scan, removing
+        # duplicates while preserving order
+        policy_ids = list(dict.fromkeys(_POLICY_ID_RE.findall(stdout)))
+
+        return build_response(decision, policy_ids, [])
 
     def _handle_query_constraints(self, query_request):
         """Handle TPE query-constraints request."""
@@ -158,27 +1011,17 @@ class CedarPDPHandler(BaseHTTPRequestHandler):
         action = query_request["action"]
         resource = query_request["resource"]
 
-        # Parse entity ID format: "Namespace::Type::\"eid\""
-        def parse_entity_id(full_id):
-            """Parse Cedar entity ID into type and eid."""
-            # Example: "OpenClaw::Agent::\"main\"" -> ("OpenClaw::Agent", "main")
-            parts = full_id.split("::")
-            if len(parts) >= 3:
-                entity_type = "::".join(parts[:-1])
-                eid = parts[-1].strip('"')
-                return entity_type, eid
-            return full_id, ""
+        # Remember the residual authorization policies for this triple so
+        # /authorize can skip the full policy set for it
+        if cedarpy is not None:
+            _policy_store.compile_residual(principal, action, resource)
 
         principal_type, principal_eid = parse_entity_id(principal)
         resource_type, resource_eid = parse_entity_id(resource)
 
         # Call cedar tpe with individual arguments (no context - that's what we're querying)
         result = subprocess.run(
-            [
-                'cedar', 'tpe',
-                '--schema', str(SCHEMA),
-                '--policies', str(POLICIES_TPE),
-                '--entities', str(ENTITIES),
+            _CEDAR_TPE_CMD_PREFIX + [
                 '--principal-type', principal_type,
                 '--principal-eid', principal_eid,
                 '--action', action,
@@ -187,70 +1030,55 @@ class CedarPDPHandler(BaseHTTPRequestHandler):
             ],
             capture_output=True,
             text=True,
-            cwd=str(CEDAR_DIR)
+            cwd=_CEDAR_CWD
         )
 
-        # Debug: Show Cedar TPE output
-        print("\n--- Cedar TPE Query ---")
-        print("Principal: {} ({})".format(principal_type, principal_eid))
-        print("Action: {}".format(action))
-        print("Resource: {} ({})".format(resource_type, resource_eid))
-        print("\n--- Cedar TPE Output ---")
-        print(result.stdout)
-        if result.stderr:
-            print("--- Cedar TPE Errors ---")
-            print(result.stderr)
-        print("--- End Cedar TPE Output ---\n")
-
-        # Parse residual policies from output
-        # The output contains the decision (UNKNOWN) and residual policies in Cedar syntax
-        residuals = []
-        current_residual = []
-        in_residual = False
-
-        for line in result.stdout.split('\n'):
-            # Look for policy annotations like @id("policy-2-allow-tmp-writes")
-            if line.strip().startswith('@id('):
-                if current_residual:
-                    residuals.append('\n'.join(current_residual))
-                current_residual = [line]
-                in_residual = True
-            elif in_residual:
-                if line.strip() and not line.strip().startswith('---'):
-                    current_residual.append(line)
-                elif line.strip().startswith('---') or not line.strip():
-                    if current_residual and current_residual[-1].strip().endswith(';'):
-                        residuals.append('\n'.join(current_residual))
-                        current_residual = []
-                        in_residual = False
-
-        # Add last residual if exists
-        if current_residual:
-            residuals.append('\n'.join(current_residual))
-
-        # Build response
-        response = {
-            "decision": "UNKNOWN",  # TPE always returns UNKNOWN with residuals
-            "residuals": residuals,
-            "explanation": "These are the policy constraints that must be satisfied for authorization"
-        }
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("Cedar TPE query: principal=%s (%s) action=%s resource=%s (%s)",
+                       principal_type, principal_eid, action, resource_type, resource_eid)
+            _LOG.debug("Cedar TPE output:\n%s", result.stdout)
+            if result.stderr:
+                _LOG.debug("Cedar TPE errors:\n%s", result.stderr)
 
-        # Send response
+        # Stream the response one residual at a time instead of collecting
+        # them and serializing the whole body. HTTP/1.1 clients get it with
+        # chunked encoding, so the connection stays open; HTTP/1.0 clients
+        # cannot decode that and get a body ended by closing the connection.
+        # The layout matches json_dumps(response, pretty=True)
+        chunked = self.request_version != 'HTTP/1.0'
         self.send_response(200)
         self.send_header('Content-Type', 'application/json')
+        if chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+        else:
+            self.send_header('Connection', 'close')
+            self.close_connection = True
         self.end_headers()
-        self.wfile.write(json.dumps(response, indent=2).encode('utf-8'))
+
+        def write(data):
+            self.wfile.write(b'%X\r\n%s\r\n' % (len(data), data) if chunked else data)
+
+        write(b'{\n  "decision": "UNKNOWN",\n  "residuals": [')  # TPE always returns UNKNOWN with residuals
+        count = 0
+        for residual in iter_residuals(result.stdout):
+            write((b',\n    ' if count else b'\n    ') + json_dumps(residual))
+            count += 1
+        write(b'\n  ],\n' if count else b'],\n')
+        write(b'  "explanation": ' + json_dumps(TPE_EXPLANATION) + b'\n}')
+        if chunked:
+            self.wfile.write(b'0\r\n\r\n')
 
         # Log
-        print("[TPE Query] {} - returned {} residual policies".format(action, len(residuals)))
+        print("[TPE Query] {} - returned {} residual policies".format(action, count))
 
     def do_GET(self):
         """Handle GET requests (health check)."""
         if self.path == "/health":
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({"status": "ok"}).encode('utf-8'))
+            self._send_json({
+                "status": "ok",
+                "decisionCache": self.decision_cache.stats(),
+                "residualCache": _policy_store.snapshot()[5].stats()
+            })
         else:
             self.send_error(404, "Not Found - use POST /authorize or GET /health")
 
@@ -262,13 +1090,19 @@ def main():
     """Start the Cedar PDP server."""
     port = 8180
 
-    # Verify Cedar CLI is installed
+    # Decisions are always printed; set PDP_LOG=DEBUG for per-request Cedar diagnostics
+    log_level = os.environ.get('PDP_LOG', 'INFO').upper()
+    if not isinstance(logging.getLevelName(log_level), int):
+        sys.stderr.write("WARNING: unknown PDP_LOG level {!r}, using INFO\n".format(log_level))
+        log_level = 'INFO'
+    logging.basicConfig(level=log_level, stream=sys.stdout, format="%(levelname)s %(message)s")
+
+    # Verify Cedar CLI is installed (required for TPE, and for /authorize without cedarpy)
     try:
         subprocess.run(['cedar', '--version'], capture_output=True, check=True)
+        cedar_cli_available = True
     except (FileNotFoundError, subprocess.CalledProcessError):
-        sys.stderr.write("ERROR: cedar CLI not found\n")
-        sys.stderr.write("Install with: brew install cedar\n")
-        sys.exit(1)
+        cedar_cli_available = False
 
     # Verify policy files exist
     for path in [SCHEMA, POLICIES, ENTITIES]:
@@ -276,14 +1110,47 @@ def main():
             sys.stderr.write("ERROR: {} not found\n".format(path))
             sys.exit(1)
 
+    # Parse schema, policies and entities once up front
+    try:
+        _policy_store.reload()
+    except ValueError as e:
+        sys.stderr.write("ERROR: failed to load Cedar policies: {}\n".format(e))
+        sys.exit(1)
+
+    # Without cedarpy, prefer the long-lived Node worker over one CLI process per request
+    if cedarpy is None:
+        worker = CedarWorker()
+        if worker.start():
+            _policy_store.cedar_worker = worker
+        elif not cedar_cli_available:
+            sys.stderr.write("ERROR: no Cedar engine available (cedarpy, cedar-wasm worker or cedar CLI)\n")
+            sys.stderr.write("Install with: pip3 install cedarpy (or: brew install cedar)\n")
+            sys.exit(1)
+
+    if not cedar_cli_available:
+        print("Warning: cedar CLI not found - /query-constraints endpoint will not work")
+        print()
+
     # Check for TPE policies (optional, warn if missing)
     if not POLICIES_TPE.exists():
         print("Warning: {} not found - /query-constraints endpoint will not work".format(POLICIES_TPE))
         print("TPE queries require policies with 'has' checks for optional context attributes")
         print()
 
-    # Start server
-    server = HTTPServer(('localhost', port), CedarPDPHandler)
+    # Authorize one synthetic request per action, bypassing the decision
+    # cache, so the first real request does not pay for a cold engine. The
+    # CLI fallback starts a fresh process per request, so it is not warmed
+    start = time.perf_counter()
+    warm_up = warm_up_requests(SCHEMA.read_text())
+    _policy_store.warm_up(warm_up)
+    _LOG.debug("Warmed up %d actions in %.1f ms", len(warm_up), (time.perf_counter() - start) * 1000)
+
+    # Reload policies and entities in the background when they change
+    _policy_store.watch()
+
+    # Start server (one thread per connection so slow requests don't block others)
+    server = ThreadingHTTPServer(('localhost', port), CedarPDPHandler)
+    server.daemon_threads = True
 
     print("=" * 70)
     print("Cedar PDP Server for OpenClaw Authorization")
@@ -296,9 +1163,17 @@ def main():
     if POLICIES_DELEGATION.exists():
         print("Delegation: {}".format(POLICIES_DELEGATION.relative_to(REPO_ROOT)))
     print("Entities:   {}".format(ENTITIES.relative_to(REPO_ROOT)))
+    if cedarpy is not None:
+        engine = "cedarpy (in-process)"
+    elif _policy_store.cedar_worker is not None:
+        engine = "cedar-wasm worker (node)"
+    else:
+        engine = "cedar CLI"
+    print("Engine:     {}".format(engine))
     print()
     print("Endpoints:")
     print("  POST /authorize          - Authorization requests (reactive)")
+    print("  POST /authorize-batch    - Batched authorization requests")
     print("  POST /query-constraints  - TPE constraint queries (proactive)")
     print("  GET  /health             - Health check")
     print()
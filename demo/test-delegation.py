@@ -11,7 +11,9 @@ Prerequisites:
 """
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 
 PDP_URL = "http://localhost:8180/authorize"
 
@@ -210,41 +212,48 @@ def run_tests():
     print("=" * 70)
     print()
 
-    for test in TESTS:
-        name = test["name"]
-        expected = test["expected"]
-        try:
-            resp = requests.post(PDP_URL, json=test["request"], timeout=5)
-            resp.raise_for_status()
-            result = resp.json()
-            decision = result["decision"]
-            policies = result.get("diagnostics", {}).get("reason", [])
+    # Send all requests concurrently over one pooled session; results are
+    # still reported in test order
+    session = requests.Session()
+    session.mount('http://', HTTPAdapter(pool_maxsize=16))
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        pending = [executor.submit(session.post, PDP_URL, json=test["request"], timeout=5)
+                   for test in TESTS]
+        for test, pending_resp in zip(TESTS, pending):
+            name = test["name"]
+            expected = test["expected"]
+            try:
+                resp = pending_resp.result()
+                resp.raise_for_status()
+                result = resp.json()
+                decision = result["decision"]
+                policies = result.get("diagnostics", {}).get("reason", [])
 
-            status = "PASS" if decision == expected else "FAIL"
-            symbol = "\u2713" if status == "PASS" else "\u2717"
+                status = "PASS" if decision == expected else "FAIL"
+                symbol = "\u2713" if status == "PASS" else "\u2717"
 
-            print(f"Test: {name}")
-            print(f"  Decision: {decision} (expected {expected})")
-            if policies:
-                print(f"  Policies: {', '.join(policies)}")
-            print(f"  {symbol} {status}")
-            print()
+                print(f"Test: {name}")
+                print(f"  Decision: {decision} (expected {expected})")
+                if policies:
+                    print(f"  Policies: {', '.join(policies)}")
+                print(f"  {symbol} {status}")
+                print()
 
-            if status == "PASS":
-                passed += 1
-            else:
+                if status == "PASS":
+                    passed += 1
+                else:
+                    failed += 1
+            except requests.ConnectionError:
+                print(f"Test: {name}")
+                print("  ERROR: Cannot connect to PDP server at {}".format(PDP_URL))
+                print("  Start it with: python3 demo/cedar-pdp-server.py")
+                print()
+                failed += 1
+            except Exception as e:
+                print(f"Test: {name}")
+                print(f"  ERROR: {e}")
+                print()
                 failed += 1
-        except requests.ConnectionError:
-            print(f"Test: {name}")
-            print("  ERROR: Cannot connect to PDP server at {}".format(PDP_URL))
-            print("  Start it with: python3 demo/cedar-pdp-server.py")
-            print()
-            failed += 1
-        except Exception as e:
-            print(f"Test: {name}")
-            print(f"  ERROR: {e}")
-            print()
-            failed += 1
 
     print("=" * 70)
     print(f"Results: {passed} passed, {failed} failed")
@@ -7,9 +7,10 @@ Sends sample authorization requests and displays results.
 import json
 import sys
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 
-PDP_URL = "http://localhost:8180/authorize"
+PDP_URL = "http://localhost:8180/authorize-batch"
 
 # Test scenarios
 TESTS = [
@@ -112,9 +113,13 @@ def test_pdp():
     print("=" * 70)
     print()
 
+    # One keep-alive session for the health check and the batch request
+    session = requests.Session()
+    session.mount('http://', HTTPAdapter(pool_maxsize=16))
+
     # Check if server is running
     try:
-        response = requests.get("http://localhost:8180/health", timeout=2)
+        response = session.get("http://localhost:8180/health", timeout=2)
         if response.status_code != 200:
             print("ERROR: PDP server is not healthy")
             sys.exit(1)
@@ -126,39 +131,43 @@ def test_pdp():
     passed = 0
     failed = 0
 
-    for i, test in enumerate(TESTS, 1):
+    # Send every scenario in one batch request
+    try:
+        response = session.post(
+            PDP_URL,
+            json={"requests": [test['request'] for test in TESTS]},
+            headers={'Content-Type': 'application/json'},
+            timeout=5
+        )
+    except Exception as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    if response.status_code != 200:
+        print(f"ERROR: HTTP {response.status_code}: {response.text}")
+        sys.exit(1)
+
+    results = response.json()
+
+    for i, (test, result) in enumerate(zip(TESTS, results), 1):
         print(f"Test {i}: {test['name']}")
         print(f"  Expected: {test['expected']}")
 
-        try:
-            response = requests.post(
-                PDP_URL,
-                json=test['request'],
-                headers={'Content-Type': 'application/json'},
-                timeout=5
-            )
-
-            if response.status_code == 200:
-                result = response.json()
-                decision = result['decision']
-                print(f"  Decision: {decision}")
-
-                if decision == test['expected']:
-                    print("  ✓ PASS")
-                    passed += 1
-                else:
-                    print("  ✗ FAIL")
-                    failed += 1
-            else:
-                print(f"  ✗ HTTP {response.status_code}: {response.text}")
-                failed += 1
-
-        except Exception as e:
-            print(f"  ✗ ERROR: {e}")
+        decision = result['decision']
+        print(f"  Decision: {decision}")
+
+        if decision == test['expected']:
+            print("  ✓ PASS")
+            passed += 1
+        else:
+            print("  ✗ FAIL")
             failed += 1
 
         print()
 
+    # A short batch response means some scenarios were never answered
+    failed += len(TESTS) - len(results)
+
     # Summary
     print("=" * 70)
     print(f"Results: {passed} passed, {failed} failed")
@@ -6,7 +6,9 @@ Sends TPE queries to discover what operations are permitted.
 """
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 
 PDP_URL = "http://localhost:8180/query-constraints"
 
@@ -47,13 +49,13 @@ TESTS = [
     },
 ]
 
-def run_test(test):
-    """Run a single TPE query test."""
+def run_test(test, pending_response):
+    """Check the response to a single TPE query test."""
     print("\nTest: {}".format(test["name"]))
     print("  Query: {}".format(test["request"]["action"].split("::")[-1].strip('"')))
 
     try:
-        response = requests.post(PDP_URL, json=test["request"], timeout=5)
+        response = pending_response.result()
 
         if response.status_code != 200:
             print("  ✗ FAIL - HTTP {}".format(response.status_code))
@@ -113,11 +115,18 @@ def main():
     passed = 0
     failed = 0
 
-    for test in TESTS:
-        if run_test(test):
-            passed += 1
-        else:
-            failed += 1
+    # Send all queries concurrently over one pooled session, then check the
+    # responses in order so the output stays readable
+    session = requests.Session()
+    session.mount('http://', HTTPAdapter(pool_maxsize=16))
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        pending = [executor.submit(session.post, PDP_URL, json=test["request"], timeout=5)
+                   for test in TESTS]
+        for test, pending_response in zip(TESTS, pending):
+            if run_test(test, pending_response):
+                passed += 1
+            else:
+                failed += 1
 
     print("\n" + "=" * 70)
     print("Results: {} passed, {} failed".format(passed, failed))